@@ -1,9 +1,12 @@
+import hashlib
 import logging
 import os
 import sys
 import time
 from contextlib import suppress
 from http import HTTPStatus
+from pathlib import Path
+from typing import Callable
 
 import requests
 import telegram
@@ -16,34 +19,51 @@ load_dotenv()
 
 logger: logging.Logger = logging.getLogger(__name__)
 
-s_handler: logging.StreamHandler = logging.StreamHandler(sys.stdout)
-formatter: logging.Formatter = logging.Formatter(
-    '%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - line'
-    ' #%(lineno)d - %(message)s'
-)
-s_handler.setLevel(logging.DEBUG)
-s_handler.setFormatter(formatter)
-
-logger.addHandler(s_handler)
+if not logger.handlers:
+    s_handler: logging.StreamHandler = logging.StreamHandler(sys.stdout)
+    formatter: logging.Formatter = logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - line'
+        ' #%(lineno)d - %(message)s'
+    )
+    s_handler.setLevel(logging.DEBUG)
+    s_handler.setFormatter(formatter)
+    logger.addHandler(s_handler)
 
 PRACTICUM_TOKEN: str = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN: str = os.getenv('BOT_TOKEN')
 TELEGRAM_CHAT_ID: str = os.getenv('CHAT_ID')
 
 RETRY_PERIOD = 600
+SEND_SPACING = 1.05
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+REQUEST_TIMEOUT = (5, 30)
+MAX_CATCHUP = 24 * 60 * 60
+CACHE_DIR: Path = Path(
+    os.getenv('BOT_CACHE_DIR') or Path.home() / '.cache' / 'homework_bot'
+)
+LAST_ERROR_CACHE: Path = CACHE_DIR / 'last_err'
+TIMESTAMP_CACHE: Path = CACHE_DIR / 'timestamp'
 HOMEWORKS_KEY = 'homeworks'
 CURR_TIME_KEY = 'current_date'
 HOMEWORK_NAME_KEY = 'homework_name'
 HOMEWORK_STATUS_KEY = 'status'
 
+_HOMEWORK_KEYS: frozenset[str] = frozenset(
+    (HOMEWORK_NAME_KEY, HOMEWORK_STATUS_KEY)
+)
+
 HOMEWORK_VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.',
 }
 
+_STATUS_TEMPLATES: dict[str, str] = {
+    status: f'Изменился статус проверки работы "%s". {verdict}'
+    for status, verdict in HOMEWORK_VERDICTS.items()
+}
+
 
 def check_tokens() -> None:
     """Checks tokens availability and validity.
@@ -66,11 +86,18 @@ def send_message(bot: telegram.Bot, message: str) -> None:
 
     Raises: TgBotError
     """
-    logger.debug(f'Starting to send message to chat ID {TELEGRAM_CHAT_ID}')
+    logger.debug('Starting to send message to chat ID %s', TELEGRAM_CHAT_ID)
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        try:
+            bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        except telegram.error.RetryAfter as err:
+            logger.debug(
+                'Hit Telegram rate limit, retrying in %s s.', err.retry_after
+            )
+            time.sleep(err.retry_after)
+            bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
         logger.debug(
-            f'Sent message: "{message}" to chat ID {TELEGRAM_CHAT_ID}'
+            'Sent message: "%s" to chat ID %s', message, TELEGRAM_CHAT_ID
         )
     except telegram.error.TelegramError as err:
         err_msg = (
@@ -88,7 +115,12 @@ def get_api_answer(
     """
     payload = {'from_date': timestamp}
     try:
-        res = requests.get(ENDPOINT, headers=HEADERS, params=payload)
+        res = requests.get(
+            ENDPOINT,
+            headers=HEADERS,
+            params=payload,
+            timeout=REQUEST_TIMEOUT,
+        )
     except requests.exceptions.RequestException as err:
         err_msg = (
             f'Error while requesting API answer from endpoint "{ENDPOINT}"'
@@ -96,8 +128,9 @@ def get_api_answer(
         )
         raise ConnectionError(err_msg) from err
 
-    logger.info(
-        f'Made successful request to homework API, status: {res.status_code}.'
+    logger.debug(
+        'Made successful request to homework API, status: %s.',
+        res.status_code,
     )
     if res.status_code != HTTPStatus.OK:
         err_msg: str = (
@@ -114,27 +147,26 @@ def check_response(response: JSONAnswer) -> None:
     Raises: KeyError, TypeError
     """
     logger.debug('Starting to check API answer...')
-    if not isinstance(response, dict):
+    try:
+        homeworks: list[Homework] = response[HOMEWORKS_KEY]
+        response[CURR_TIME_KEY]
+    except TypeError as err:
         err_msg = (
             f'Response object type is {type(response)}, expected type: dict.'
         )
-        raise TypeError(err_msg)
-
-    answer_keys = [HOMEWORKS_KEY, CURR_TIME_KEY]
-    missing_keys: list[str] = [
-        key for key in answer_keys if key not in response
-    ]
-    if missing_keys:
-        keys = ', '.join(missing_keys)
-        err_msg = f'Not found keys [{keys}] in response.'
-        raise KeyError(err_msg)
+        raise TypeError(err_msg) from err
+    except KeyError as err:
+        err_msg = f'Not found key {err} in response.'
+        raise KeyError(err_msg) from err
 
-    homeworks: list[Homework] = response.get(HOMEWORKS_KEY)
     if not isinstance(homeworks, list):
         err_msg = (
             f'Homeworks object type is {type(homeworks)}, expected type: list.'
         )
         raise TypeError(err_msg)
+
+    if not homeworks:
+        return
     logger.debug('API answer checked successfully.')
 
 
@@ -144,23 +176,107 @@ def parse_status(homework: Homework) -> str:
     Raises: KeyError
     """
     logger.debug('Starting to check homework status...')
-    homework_keys = [HOMEWORK_NAME_KEY, HOMEWORK_STATUS_KEY]
-    missing_keys = [key for key in homework_keys if key not in homework]
+    missing_keys = _HOMEWORK_KEYS - homework.keys()
     if missing_keys:
-        keys = ', '.join(missing_keys)
+        keys = ', '.join(sorted(missing_keys))
         err_msg = f'Not found keys [{keys}] in homework obj.'
         raise KeyError(err_msg)
 
     status: str = homework.get(HOMEWORK_STATUS_KEY)
-    try:
-        verdict: str = HOMEWORK_VERDICTS[status]
-    except KeyError:
+    template = _STATUS_TEMPLATES.get(status)
+    if template is None:
         err_msg = f'Not found key {status} in verdicts dict.'
         raise KeyError(err_msg)
     logger.debug('Homework status checked successfully.')
 
     homework_name: str = homework.get(HOMEWORK_NAME_KEY)
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return template % homework_name
+
+
+def send_new_statuses(
+    bot: telegram.Bot,
+    homeworks: list[Homework],
+    seen_statuses: dict[str, str],
+) -> None:
+    """Sends changed statuses oldest first, spacing consecutive sends.
+
+    Raises: TgBotError, KeyError
+    """
+    sent = 0
+    for homework in reversed(homeworks):
+        name = homework.get(HOMEWORK_NAME_KEY)
+        status = homework.get(HOMEWORK_STATUS_KEY)
+        if seen_statuses.get(name) == status:
+            continue
+        if sent:
+            time.sleep(SEND_SPACING)
+        send_message(bot, parse_status(homework))
+        seen_statuses[name] = status
+        sent += 1
+
+
+def _write_cache(path: Path, text: str) -> None:
+    """Writes text to a cache file, creating its directory if needed."""
+    with suppress(OSError):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def _load_timestamp() -> int:
+    """Returns the persisted poll cursor or a fresh one-period window.
+
+    The cursor is clamped to at most MAX_CATCHUP seconds in the past,
+    so a stale cache cannot replay the whole status history.
+    """
+    with suppress(OSError, ValueError):
+        return max(
+            int(TIMESTAMP_CACHE.read_text()),
+            int(time.time()) - MAX_CATCHUP,
+        )
+    return int(time.time()) - RETRY_PERIOD
+
+
+def _store_timestamp(timestamp: int) -> None:
+    """Persists the poll cursor so a restart does not replay the window."""
+    _write_cache(TIMESTAMP_CACHE, str(timestamp))
+
+
+def make_error_notifier(
+    bot: telegram.Bot,
+) -> tuple[Callable[[str], None], Callable[[], None]]:
+    """Creates a sender that skips errors already reported to the chat.
+
+    Returns a (notify, reset) pair. The digest of the last reported
+    error is kept in LAST_ERROR_CACHE, so duplicates are not re-sent
+    after a process restart; reset clears it once the bot recovers, so
+    a later recurrence of the same error is reported again.
+
+    Raises: TgBotError
+    """
+    last_digest = ''
+    with suppress(OSError):
+        last_digest = LAST_ERROR_CACHE.read_text()
+
+    def notify(message: str) -> None:
+        """Sends message unless it repeats the previously sent one."""
+        nonlocal last_digest
+        digest = hashlib.blake2b(message.encode(), digest_size=8).hexdigest()
+        if digest == last_digest:
+            return
+        send_message(bot, message)
+        last_digest = digest
+        _write_cache(LAST_ERROR_CACHE, digest)
+
+    def reset() -> None:
+        """Forgets the last reported error, in memory and on disk."""
+        nonlocal last_digest
+        if not last_digest:
+            return
+        last_digest = ''
+        with suppress(OSError):
+            LAST_ERROR_CACHE.unlink(missing_ok=True)
+
+    return notify, reset
 
 
 def main() -> None:
@@ -172,32 +288,33 @@ def main() -> None:
     """
     check_tokens()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    timestamp = int(time.time())
-    last_msg = ''
+    timestamp = _load_timestamp()
+    notify_error, reset_error = make_error_notifier(bot)
+    seen_statuses: dict[str, str] = {}
     while True:
         try:
             api_ans: JSONAnswer = get_api_answer(timestamp)
             check_response(api_ans)
             homeworks: list[Homework] = api_ans.get(HOMEWORKS_KEY)
             if homeworks:
-                msg = parse_status(homeworks.pop())
-                send_message(bot, msg)
-                last_msg = msg
+                send_new_statuses(bot, homeworks, seen_statuses)
             else:
                 logger.debug('No new statuses in homeworks.')
-            timestamp = api_ans.get(CURR_TIME_KEY)
+            timestamp = api_ans[CURR_TIME_KEY]
+            _store_timestamp(timestamp)
+            reset_error()
         except TgBotError as err:
             logger.error(err, exc_info=True)
         except Exception as err:
             err_msg = f'Ошибка при работе бота: {err}'
-            if err_msg != last_msg:
-                with suppress(TgBotError):
-                    send_message(bot, err_msg)
-                    last_msg = err_msg
+            with suppress(TgBotError):
+                notify_error(err_msg)
             logger.error(err, exc_info=True)
-        finally:
-            time.sleep(RETRY_PERIOD)
+        time.sleep(RETRY_PERIOD)
 
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info('Bot stopped.')